@@ -1,3 +1,12 @@
-from .pip_search import *
+from importlib import import_module
 
-__version__ = "0.0.10"
+from ._version import __version__
+
+__all__ = ["Config", "Package", "config", "search"]
+
+
+def __getattr__(name: str):
+    # Defer importing the search module (requests, lxml, ...) to first use
+    if name in __all__:
+        return getattr(import_module(".pip_search", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,28 @@
 import argparse
 import sys
+from typing import TYPE_CHECKING, Callable, Union
 from urllib.parse import urlencode
 
-from rich.console import Console
-from rich.table import Table
+from ._version import __version__
 
-from pip_search.pip_search import config, search
+if TYPE_CHECKING:
+    from .pip_search import Package
 
-from . import __version__
-from .utils import check_version
+
+def _decorate_version(
+    package: "Package", check_version: Callable[[str], Union[str, bool]]
+) -> str:
+    """Mark up the package version against the installed one, if any
+
+    Returns:
+        str: Version string with rich markup
+    """
+    installed_version = check_version(package.name)
+    if installed_version is False:
+        return package.version
+    if installed_version == package.version:
+        return f"[bold cyan]{package.version} ==[/]"
+    return f"{package.version} > [bold purple]{installed_version}[/]"
 
 
 def main():
@@ -43,13 +57,29 @@ def main():
         nargs="?",
         help="format for release date, (default: %(default)s)",
     )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="query pypi.org even if recent results are cached",
+    )
     args = ap.parse_args()
-    query = " ".join(args.query)
-    result = search(query, opts=args)
     if not args.query:
         ap.print_help()
         sys.exit(1)
 
+    # Imported only once there is a search to run, so --help, --version
+    # and usage errors return without loading them
+    from rich.console import Console
+    from rich.table import Table
+
+    from .pip_search import config, search
+    from .utils import check_version
+
+    if args.no_cache:
+        config.cache_expire = 0
+    query = " ".join(args.query)
+    result = search(query, opts=args)
+
     table = Table(
         title=(
             "[not italic]:snake:[/] [bold][magenta]"
@@ -63,16 +93,9 @@ def main():
     table.add_column("Description", style="bold blue")
     emoji = ":open_file_folder:"
     for package in result:
-        checked_version = check_version(package.name)
-        if checked_version == package.version:
-            package.version = f"[bold cyan]{package.version} ==[/]"
-        elif checked_version is not False:
-            package.version = (
-                f"{package.version} > [bold purple]{checked_version}[/]"
-            )
         table.add_row(
             f"[link={package.link}]{emoji}[/link] {package.name}",
-            package.version,
+            _decorate_version(package, check_version),
             package.released_date_str(args.date_format),
             package.description,
         )
@@ -1,12 +1,52 @@
 import re
+import sqlite3
+import sys
 from argparse import Namespace
-from dataclasses import InitVar, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Generator, Union
+from functools import lru_cache
+from html import unescape
+from io import BytesIO
+from typing import BinaryIO, Generator, List, Optional, Union
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from diskcache import Cache, Timeout
+from lxml import etree
+from packaging.version import InvalidVersion, Version
+from platformdirs import user_cache_dir
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_WHITESPACE = re.compile(r"\s+")
+# Fast path for PyPI's current snippet markup; _parse_snippets is the
+# fallback whenever the page no longer matches it
+_SNIPPET_CLASS = 'class="package-snippet"'
+_SNIPPET = re.compile(
+    r'<a class="package-snippet"\s+href="(?P<href>[^"]*)"[^>]*>'
+    r'(?:(?!</a>).)*?<span class="package-snippet__name">'
+    r"(?P<name>[^<]*)</span>"
+    r'(?:(?!</a>).)*?<span class="package-snippet__version">'
+    r"(?P<version>[^<]*)</span>"
+    r'(?:(?!</a>).)*?<time datetime="(?P<released>[^"]*)"'
+    r'(?:(?!</a>).)*?<p class="package-snippet__description">'
+    r"(?P<description>[^<]*)</p>",
+    re.DOTALL,
+)
+_NAME = etree.XPath(
+    'string(.//span[contains(@class, "package-snippet__name")])'
+)
+_VERSION = etree.XPath(
+    'string(.//span[contains(@class, "package-snippet__version")])'
+)
+_RELEASED = etree.XPath(
+    'string(.//span[contains(@class, "package-snippet__created")]'
+    "//time/@datetime)"
+)
+_DESCRIPTION = etree.XPath(
+    'string(.//p[contains(@class, "package-snippet__description")])'
+)
 
 
 class Config:
@@ -14,6 +54,9 @@ class Config:
 
     api_url: str = "https://pypi.org/search/"
     page_size: int = 2
+    timeout: int = 10
+    retries: int = 3
+    cache_expire: int = 300
     sort_by: str = "name"
     date_format: str = "%d-%-m-%Y"
     link_defualt_format: str = "https://pypi.org/project/{package.name}"
@@ -21,8 +64,38 @@ class Config:
 
 config = Config()
 
+@lru_cache(maxsize=1)
+def _session(retries: int, pool_size: int) -> requests.Session:
+    """HTTP session for PyPI requests, rebuilt when Config.retries or
+    Config.page_size change
+
+    Returns:
+        requests.Session: Session pooling up to pool_size connections
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # Render whatever came back rather than raising RetryError
+                raise_on_status=False,
+                # Only our own short backoff, never a server-chosen wait
+                respect_retry_after_header=False,
+            ),
+        ),
+    )
+    return session
+
+
+# Slotted packages drop the per-instance __dict__ (Python 3.10+)
+_dataclass_options = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_dataclass_options)
 class Package:
     """Package class"""
 
@@ -30,14 +103,32 @@ class Package:
     version: str
     released: str
     description: str
-    link: InitVar[str] = None
+    link: str = None
+    _released_date: datetime = field(
+        init=False, default=None, repr=False, compare=False
+    )
 
-    def __post_init__(self, link: str = None):
-        self.link = link or config.link_defualt_format.format(package=self)
-        self.released_date = datetime.strptime(
-            self.released, "%Y-%m-%dT%H:%M:%S%z"
+    def __post_init__(self):
+        self.link = self.link or config.link_defualt_format.format(
+            package=self
         )
 
+    @property
+    def released_date(self) -> datetime:
+        """Release date, parsed from `released` on first access
+
+        Returns:
+            datetime: Release date, None if unknown
+        """
+        if self._released_date is None and self.released:
+            try:
+                self._released_date = datetime.fromisoformat(self.released)
+            except ValueError:
+                self._released_date = datetime.strptime(
+                    self.released, "%Y-%m-%dT%H:%M:%S%z"
+                )
+        return self._released_date
+
     def released_date_str(self, date_format: str = config.date_format) -> str:
         """Return the released date as a string formatted
         according to date_formate ou Config.date_format (default)
@@ -45,9 +136,135 @@ class Package:
         Returns:
             str: Formatted date string
         """
+        if self.released_date is None:
+            return ""
         return self.released_date.strftime(date_format)
 
 
+def _version_key(version: str) -> tuple:
+    """Sort key for a version string, placing versions that are not
+    PEP 440 compliant first, as pkg_resources' legacy versions were
+    """
+    try:
+        return (1, Version(version))
+    except InvalidVersion:
+        return (0, version)
+
+
+def _link(link_base: str, href: str) -> str:
+    """Absolute link of a snippet href, PyPI's being site-absolute paths"""
+    if href.startswith("/") and not href.startswith("//"):
+        return link_base + href
+    return urljoin(config.api_url, href)
+
+
+def _parse_snippets(
+    source: BinaryIO, encoding: str = None
+) -> Generator[Package, None, None]:
+    """Parse the package snippets of a search result page with lxml,
+    discarding each snippet once its package is built
+
+    Yields:
+        Package: package object
+    """
+    link_base = urljoin(config.api_url, "/").rstrip("/")
+    try:
+        for _, snippet in etree.iterparse(
+            source, tag="a", html=True, encoding=encoding
+        ):
+            if "package-snippet" in snippet.get("class", ""):
+                link = _link(link_base, snippet.get("href", ""))
+                package = _WHITESPACE.sub(" ", _NAME(snippet).strip())
+                version = _WHITESPACE.sub(" ", _VERSION(snippet).strip())
+                released = _WHITESPACE.sub(" ", _RELEASED(snippet))
+                description = _WHITESPACE.sub(
+                    " ", _DESCRIPTION(snippet).strip()
+                )
+                yield Package(package, version, released, description, link)
+            snippet.clear(keep_tail=True)
+    except etree.XMLSyntaxError:
+        # Empty response body
+        return
+
+
+def _parse_page(content: bytes, encoding: str = None) -> List[Package]:
+    """Parse a search result page, with a single regular expression when
+    it matches every snippet on the page and with lxml otherwise
+
+    Returns:
+        list: Packages of the page
+    """
+    text = content.decode(encoding or "utf-8", "replace")
+    matches = list(_SNIPPET.finditer(text))
+    if not matches or len(matches) != text.count(_SNIPPET_CLASS):
+        return list(_parse_snippets(BytesIO(content), encoding))
+
+    link_base = urljoin(config.api_url, "/").rstrip("/")
+
+    def clean(value: str) -> str:
+        return _WHITESPACE.sub(" ", unescape(value).strip())
+
+    return [
+        Package(
+            clean(match["name"]),
+            clean(match["version"]),
+            clean(match["released"]),
+            clean(match["description"]),
+            _link(link_base, unescape(match["href"])),
+        )
+        for match in matches
+    ]
+
+
+# The cache is an optimisation only: failing to use it must not fail a search
+_CACHE_ERRORS = (OSError, sqlite3.Error, Timeout)
+
+
+@lru_cache(maxsize=1)
+def _cache() -> Optional[Cache]:
+    try:
+        return Cache(user_cache_dir("pip_search"))
+    except _CACHE_ERRORS:
+        return None
+
+
+def _fetch_page(
+    session: requests.Session, cache: Optional[Cache], query: str, page: int
+) -> List[tuple]:
+    """Fetch and parse a search result page, served from the on-disk cache
+    for Config.cache_expire seconds when a cache is given
+
+    Returns:
+        list: (name, version, released, description, link) of each package
+    """
+    key = (config.api_url, query, page)
+    if cache is not None:
+        try:
+            rows = cache.get(key)
+        except _CACHE_ERRORS:
+            rows = None
+        if rows is not None:
+            return rows
+
+    r = session.get(
+        config.api_url,
+        params={"q": query, "page": page},
+        timeout=config.timeout,
+    )
+    # Let lxml read <meta charset> unless the server declared one
+    declared = "charset" in r.headers.get("content-type", "")
+    rows = [
+        (p.name, p.version, p.released, p.description, p.link)
+        for p in _parse_page(r.content, r.encoding if declared else None)
+    ]
+    if cache is not None and r.ok:
+        try:
+            cache.set(key, rows, expire=config.cache_expire)
+        except _CACHE_ERRORS:
+            pass
+    return rows
+
+
 def search(
     query: str, opts: Union[dict, Namespace] = {}
 ) -> Generator[Package, None, None]:
@@ -56,58 +273,28 @@ def search(
     Yields:
         Package: package object
     """
-    snippets = []
-    s = requests.Session()
-    for page in range(1, config.page_size + 1):
-        params = {"q": query, "page": page}
-        r = s.get(config.api_url, params=params)
-        soup = BeautifulSoup(r.text, "html.parser")
-        snippets += soup.select('a[class*="package-snippet"]')
+    packages = []
+    session = _session(config.retries, config.page_size)
+    # Opened here, once, rather than racing to open it in each worker
+    cache = _cache() if config.cache_expire else None
+
+    def fetch(page: int) -> List[Package]:
+        rows = _fetch_page(session, cache, query, page)
+        return [Package(*row) for row in rows]
+
+    pages = range(1, config.page_size + 1)
+    with ThreadPoolExecutor(max_workers=config.page_size) as executor:
+        # Pages download concurrently, each parsed by its worker while the
+        # others are still downloading; results are gathered in page order
+        for page_packages in executor.map(fetch, pages):
+            packages += page_packages
 
     if "sort" in opts:
         if opts.sort == "name":
-            snippets = sorted(
-                snippets,
-                key=lambda s: s.select_one('span[class*="package-snippet__name"]').text.strip(),
-            )
+            packages.sort(key=lambda p: p.name)
         elif opts.sort == "version":
-            from pkg_resources import parse_version
-
-            snippets = sorted(
-                snippets,
-                key=lambda s: parse_version(
-                    s.select_one('span[class*="package-snippet__version"]').text.strip()
-                ),
-            )
+            packages.sort(key=lambda p: _version_key(p.version))
         elif opts.sort == "released":
-            snippets = sorted(
-                snippets,
-                key=lambda s: s.select_one('span[class*="package-snippet__created"]').find(
-                    "time"
-                )["datetime"],
-            )
-
-    for snippet in snippets:
-        link = urljoin(config.api_url, snippet.get("href"))
-        package = re.sub(
-            r"\s+", " ", snippet.select_one('span[class*="package-snippet__name"]').text.strip()
-        )
-        version = re.sub(
-            r"\s+",
-            " ",
-            snippet.select_one('span[class*="package-snippet__version"]').text.strip(),
-        )
-        released = re.sub(
-            r"\s+",
-            " ",
+            packages.sort(key=lambda p: p.released)
 
-            snippet.select_one('span[class*="package-snippet__created"]').find("time")[
-                "datetime"
-            ],
-        )
-        description = re.sub(
-            r"\s+",
-            " ",
-            snippet.select_one('p[class*="package-snippet__description"]').text.strip(),
-        )
-        yield Package(package, version, released, description, link)
+    yield from packages
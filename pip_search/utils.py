@@ -1,21 +1,44 @@
-from typing import Union
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+from packaging.utils import canonicalize_name
 
 try:
-    from importlib.metadata import PackageNotFoundError, distribution
+    from importlib.metadata import distributions
 except ImportError:
-    from pkg_resources import DistributionNotFound as PackageNotFoundError
-    from pkg_resources import get_distribution as distribution
+    from importlib_metadata import distributions
+
+
+def _installed() -> List[Tuple[str, str]]:
+    installed = []
+    for dist in distributions():
+        # Distribution.metadata re-reads METADATA on every access
+        meta = dist.metadata
+        if meta["Name"]:
+            installed.append((meta["Name"], meta["Version"]))
+    return installed
+
+
+@lru_cache(maxsize=1)
+def local_pip_list() -> Dict[str, str]:
+    """Map the installed distributions to their versions, read once on
+    first use.
+
+    Returns:
+        dict: Installed versions keyed by canonical package name.
+    """
+    versions = {}
+    for name, version in _installed():
+        # First on sys.path wins, as it is the one that gets imported
+        versions.setdefault(canonicalize_name(name), version)
+    return versions
 
 
+@lru_cache(maxsize=None)
 def check_version(package_name: str) -> Union[str, bool]:
     """Check if package is installed and return version.
 
     Returns:
         str | boll: Version of package if installed, False otherwise.
     """
-    try:
-        installed = distribution(package_name)
-    except PackageNotFoundError:
-        return False
-    else:
-        return installed.version
+    return local_pip_list().get(canonicalize_name(package_name), False)
@@ -18,7 +18,15 @@ setup(
     long_description=README,
     long_description_content_type="text/markdown",
     packages=find_packages(exclude=("tests",)),
-    install_requires=["bs4", "requests", "rich"],
+    install_requires=[
+        "diskcache",
+        "importlib_metadata; python_version < '3.8'",
+        "lxml",
+        "packaging",
+        "platformdirs",
+        "requests",
+        "rich",
+    ],
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",